@@ -0,0 +1,44 @@
+from fastapi import Request
+from app.services.admission import admission_controller, PriorityClass
+from app.config import get_settings
+import ipaddress
+
+settings = get_settings()
+
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(entry.strip(), strict=False)
+    for entry in settings.admission_trusted_proxies.split(",")
+    if entry.strip()
+]
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+def get_client_id(request: Request) -> str:
+    """Identify the caller for per-client limits.
+
+    X-Client-ID is only honoured from trusted proxies such as the frontend;
+    anyone else is keyed by IP so a random header cannot dodge the limit.
+    """
+    host = request.client.host if request.client else "unknown"
+    client_id = request.headers.get("x-client-id")
+    if client_id and _is_trusted_proxy(host):
+        return f"{host}:{client_id}"
+    return host
+
+def admit(priority_class: PriorityClass):
+    """Dependency that holds an admission slot of the given class for the request"""
+    async def dependency(request: Request):
+        async with admission_controller.slot(priority_class, get_client_id(request)):
+            yield
+    return dependency
+
+async def admit_upload(request: Request, bulk: bool = False):
+    """Uploads flagged with ?bulk=true are scheduled as bulk ingestion"""
+    priority_class = PriorityClass.BULK if bulk else PriorityClass.UPLOAD
+    async with admission_controller.slot(priority_class, get_client_id(request)):
+        yield
\ No newline at end of file
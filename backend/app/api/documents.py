@@ -1,9 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Response
 from app.models import DocumentUploadResponse, DocumentMetadata, DocumentStatus
 from app.services.document_processor import DocumentProcessor
-from app.services.vector_store import VectorStore
+from app.services.vector_client import get_vector_store
+from app.services.session_store import session_store
 from app.utils.file_handler import FileHandler
-from app.database import get_database
+from app.api.dependencies import admit_upload
+from app.database import get_database, get_documents_version, bump_documents_version
 from app.config import get_settings
 from datetime import datetime
 import uuid
@@ -12,7 +14,7 @@ import os
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 settings = get_settings()
 
-@router.post("/upload", response_model=DocumentUploadResponse)
+@router.post("/upload", response_model=DocumentUploadResponse, dependencies=[Depends(admit_upload)])
 async def upload_document(file: UploadFile = File(...)):
     """Upload and process a document"""
     try:
@@ -42,18 +44,21 @@ async def upload_document(file: UploadFile = File(...)):
         document_id = str(uuid.uuid4())
         
         # Create document metadata
+        now = datetime.utcnow()
         doc_metadata = {
             "_id": document_id,
             "filename": file.filename,
             "file_size": file_size,
             "file_path": file_path,
             "status": DocumentStatus.PROCESSING,
-            "upload_date": datetime.utcnow(),
+            "upload_date": now,
+            "updated_at": now,
             "page_count": 0,
             "chunk_count": 0
         }
         
         await db.documents.insert_one(doc_metadata)
+        await bump_documents_version(db)
         
         # Process document
         try:
@@ -61,7 +66,7 @@ async def upload_document(file: UploadFile = File(...)):
             text, page_count, chunks = await processor.process_document(file_path, file.filename)
             
             # Store in vector database
-            vector_store = VectorStore()
+            vector_store = get_vector_store()
             await vector_store.add_document(
                 document_id=document_id,
                 chunks=chunks,
@@ -77,9 +82,11 @@ async def upload_document(file: UploadFile = File(...)):
                 {"$set": {
                     "status": DocumentStatus.COMPLETED,
                     "page_count": page_count,
-                    "chunk_count": len(chunks)
+                    "chunk_count": len(chunks),
+                    "updated_at": datetime.utcnow()
                 }}
             )
+            await bump_documents_version(db)
             
             return DocumentUploadResponse(
                 document_id=document_id,
@@ -91,8 +98,9 @@ async def upload_document(file: UploadFile = File(...)):
         except Exception as e:
             await db.documents.update_one(
                 {"_id": document_id},
-                {"$set": {"status": DocumentStatus.FAILED}}
+                {"$set": {"status": DocumentStatus.FAILED, "updated_at": datetime.utcnow()}}
             )
+            await bump_documents_version(db)
             raise HTTPException(500, f"Error processing document: {str(e)}")
             
     except HTTPException:
@@ -101,9 +109,22 @@ async def upload_document(file: UploadFile = File(...)):
         raise HTTPException(500, f"Upload failed: {str(e)}")
 
 @router.get("", response_model=list[DocumentMetadata])
-async def list_documents():
-    """Get all documents metadata"""
+async def list_documents(request: Request, response: Response):
+    """Get all documents metadata
+
+    Responds with an ETag derived from the collection version; clients that
+    send it back in If-None-Match get a 304 without the collection being scanned.
+    """
     db = get_database()
+    version = await get_documents_version(db)
+    etag = f'W/"documents-{version}"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     documents = await db.documents.find().to_list(100)
     
     return [
@@ -148,8 +169,9 @@ async def delete_document(document_id: str):
         raise HTTPException(404, "Document not found")
     
     # Delete from vector store
-    vector_store = VectorStore()
+    vector_store = get_vector_store()
     await vector_store.delete_document(document_id)
+    await session_store.invalidate_document(db, document_id)
     
     # Delete file
     if os.path.exists(doc["file_path"]):
@@ -157,5 +179,11 @@ async def delete_document(document_id: str):
     
     # Delete from database
     await db.documents.delete_one({"_id": document_id})
+    await db.document_tombstones.replace_one(
+        {"_id": document_id},
+        {"_id": document_id, "deleted_at": datetime.utcnow()},
+        upsert=True
+    )
+    await bump_documents_version(db)
     
     return {"message": "Document deleted successfully"}
\ No newline at end of file
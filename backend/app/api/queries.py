@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from app.models import QueryRequest, QueryResponse
 from app.services.rag_service import RAGService
+from app.services.session_store import session_store
+from app.services.admission import PriorityClass
+from app.api.dependencies import admit
+from app.database import get_database
 
 router = APIRouter(prefix="/api/queries", tags=["queries"])
 
-@router.post("", response_model=QueryResponse)
+@router.post("", response_model=QueryResponse, dependencies=[Depends(admit(PriorityClass.INTERACTIVE))])
 async def query_documents(request: QueryRequest):
     """Query documents using RAG"""
     try:
@@ -12,13 +16,26 @@ async def query_documents(request: QueryRequest):
         result = await rag_service.query(
             query=request.query,
             document_ids=request.document_ids,
-            top_k=request.top_k
+            top_k=request.top_k,
+            session_id=request.session_id,
+            start_session=request.start_session
         )
         
         return QueryResponse(
             query=request.query,
             answer=result["answer"],
-            sources=result["sources"]
+            sources=result["sources"],
+            session_id=result.get("session_id"),
+            rewritten_query=result.get("rewritten_query"),
+            degraded=result.get("degraded", False)
         )
     except Exception as e:
-        raise HTTPException(500, f"Query failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Query failed: {str(e)}")
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """Forget a conversation session"""
+    if not await session_store.delete(get_database(), session_id):
+        raise HTTPException(404, "Session not found")
+    
+    return {"message": "Session deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Depends
+from app.models import SnapshotImportResponse
+from app.services.snapshot import SnapshotService, SnapshotError
+from app.services.admission import PriorityClass
+from app.api.dependencies import admit
+from app.database import get_database, bump_documents_version
+from typing import Optional
+
+router = APIRouter(prefix="/api/snapshots", tags=["snapshots"])
+
+@router.get("/export", dependencies=[Depends(admit(PriorityClass.BULK))])
+async def export_snapshot(since: Optional[float] = None):
+    """Export the index, optionally only changes after a previous snapshot time"""
+    try:
+        db = get_database()
+        data, snapshot_time = await SnapshotService().export_snapshot(db, since)
+    except Exception as e:
+        raise HTTPException(500, f"Snapshot export failed: {str(e)}")
+    
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": 'attachment; filename="index.snapshot"',
+            "X-Snapshot-Time": str(snapshot_time)
+        }
+    )
+
+@router.post("/import", response_model=SnapshotImportResponse, dependencies=[Depends(admit(PriorityClass.BULK))])
+async def import_snapshot(file: UploadFile = File(...)):
+    """Bulk load a snapshot exported by another replica"""
+    try:
+        db = get_database()
+        result = await SnapshotService().import_snapshot(db, await file.read())
+    except SnapshotError as e:
+        raise HTTPException(400, f"Invalid snapshot: {str(e)}")
+    except Exception as e:
+        raise HTTPException(500, f"Snapshot import failed: {str(e)}")
+    
+    await bump_documents_version(db)
+    
+    return SnapshotImportResponse(**result)
\ No newline at end of file
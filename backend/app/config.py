@@ -12,6 +12,10 @@ class Settings(BaseSettings):
     # ChromaDB
     chroma_persist_dir: str = "./chroma_db"
     
+    # Vector Service (empty socket = load the model and index in-process)
+    vector_service_socket: str = ""
+    vector_service_pool_size: int = 8
+    
     # App Settings
     backend_host: str = "0.0.0.0"
     backend_port: int = 8000
@@ -25,6 +29,37 @@ class Settings(BaseSettings):
     chunk_size: int = 1000
     chunk_overlap: int = 200
     
+    # Conversation Sessions
+    session_ttl_seconds: int = 1800
+    max_sessions: int = 1000
+    session_max_turns: int = 6
+    session_max_cached_chars: int = 200000
+    
+    # LLM Governor
+    llm_provider: str = "gemini"
+    llm_max_concurrency: int = 4
+    llm_max_queue: int = 32
+    llm_timeout_seconds: float = 20.0
+    llm_rewrite_timeout_seconds: float = 5.0
+    fake_llm_latency_seconds: float = 0.5
+    
+    # Admission Control
+    admission_total_slots: int = 8
+    admission_interactive_limit: int = 8
+    admission_upload_limit: int = 2
+    admission_bulk_limit: int = 1
+    admission_interactive_queue: int = 64
+    admission_upload_queue: int = 8
+    admission_bulk_queue: int = 4
+    admission_client_limit: int = 4
+    admission_client_queue: int = 8
+    # Comma-separated IPs/CIDRs (the frontend or a proxy) whose X-Client-ID header is trusted
+    admission_trusted_proxies: str = ""
+    
+    # Snapshots
+    snapshot_batch_size: int = 1000
+    snapshot_bootstrap_path: str = ""
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,5 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
 from app.config import get_settings
 
 settings = get_settings()
@@ -17,4 +17,19 @@ async def close_mongo_connection():
         mongodb.client.close()
 
 def get_database():
-    return mongodb.client[settings.mongodb_db_name]
\ No newline at end of file
+    return mongodb.client[settings.mongodb_db_name]
+
+async def get_documents_version(db) -> int:
+    """Return the change counter of the documents collection"""
+    meta = await db.collection_versions.find_one({"_id": "documents"})
+    return meta["version"] if meta else 0
+
+async def bump_documents_version(db) -> int:
+    """Increment the documents change counter after any write to the collection"""
+    meta = await db.collection_versions.find_one_and_update(
+        {"_id": "documents"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return meta["version"]
\ No newline at end of file
@@ -1,9 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import documents, queries
-from app.database import connect_to_mongo, close_mongo_connection
+from fastapi.responses import JSONResponse
+from app.api import documents, queries, snapshots
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.snapshot import bootstrap_from_snapshot
+from app.services.session_store import session_store
+from app.services.admission import admission_controller, AdmissionRejected
+from app.services.vector_client import get_vector_store
 from app.models import HealthResponse
 from app.config import get_settings
+import asyncio
 import os
 
 settings = get_settings()
@@ -23,6 +29,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Create uploads directory
 os.makedirs("uploads", exist_ok=True)
 
@@ -30,6 +44,10 @@ os.makedirs("uploads", exist_ok=True)
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
+    await session_store.ensure_indexes(get_database())
+    # With the shared vector service, start.sh bootstraps once for all workers
+    if not settings.vector_service_socket:
+        await bootstrap_from_snapshot(get_database(), settings.snapshot_bootstrap_path)
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -38,11 +56,26 @@ async def shutdown_event():
 # Include routers
 app.include_router(documents.router)
 app.include_router(queries.router)
+app.include_router(snapshots.router)
 
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
+    if settings.vector_service_socket:
+        # The shared vector service is not supervised, so surface it here
+        try:
+            await asyncio.wait_for(get_vector_store().count(), timeout=2)
+        except Exception:
+            return JSONResponse(
+                status_code=503,
+                content=HealthResponse(status="unhealthy", version="1.0.0").model_dump()
+            )
+    
     return HealthResponse(status="healthy", version="1.0.0")
 
+@app.get("/api/metrics/admission")
+async def admission_metrics():
+    return admission_controller.stats()
+
 @app.get("/")
 async def root():
     return {
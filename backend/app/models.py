@@ -28,11 +28,22 @@ class QueryRequest(BaseModel):
     query: str
     document_ids: Optional[List[str]] = None
     top_k: int = Field(default=5, ge=1, le=10)
+    session_id: Optional[str] = None
+    start_session: bool = False
 
 class QueryResponse(BaseModel):
     query: str
     answer: str
     sources: List[dict]
+    session_id: Optional[str] = None
+    rewritten_query: Optional[str] = None
+    degraded: bool = False
+    
+class SnapshotImportResponse(BaseModel):
+    snapshot_time: float
+    chunk_count: int
+    document_count: int
+    deleted_document_count: int
     
 class HealthResponse(BaseModel):
     status: str
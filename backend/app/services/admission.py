@@ -0,0 +1,192 @@
+from app.config import get_settings
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from enum import Enum
+import asyncio
+import bisect
+import itertools
+import math
+import time
+
+settings = get_settings()
+
+class PriorityClass(str, Enum):
+    INTERACTIVE = "interactive"
+    UPLOAD = "upload"
+    BULK = "bulk"
+
+PRIORITY_ORDER = {
+    PriorityClass.INTERACTIVE: 0,
+    PriorityClass.UPLOAD: 1,
+    PriorityClass.BULK: 2,
+}
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed because its class queue is full"""
+
+    def __init__(self, priority_class: PriorityClass, retry_after: int):
+        super().__init__(f"Too many {priority_class.value} requests queued")
+        self.priority_class = priority_class
+        self.retry_after = retry_after
+
+class ClassStats:
+    def __init__(self):
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service_time = 1.0
+
+    def record_wait(self, wait: float):
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def record_service(self, duration: float):
+        # Exponentially weighted, used to estimate Retry-After
+        self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * duration
+
+class AdmissionController:
+    """Shares a fixed number of work slots between priority classes.
+
+    Each class has its own concurrency limit and queue depth, and each client
+    may hold only `client_limit` slots and `client_queue_limit` queue places per
+    class, so one client cannot fill a queue that others share. When a slot
+    frees up, queued interactive requests are admitted before uploads, and
+    uploads before bulk ingestion. Requests arriving at a full queue are
+    rejected straight away.
+    """
+
+    def __init__(self, total_slots: int, class_limits: dict, queue_limits: dict,
+                 client_limit: int, client_queue_limit: int):
+        self.total_slots = total_slots
+        self.class_limits = class_limits
+        self.queue_limits = queue_limits
+        self.client_limit = client_limit
+        self.client_queue_limit = client_queue_limit
+        self.active_total = 0
+        self.active = defaultdict(int)
+        self.client_active = defaultdict(int)
+        self.queued = defaultdict(int)
+        self.client_queued = defaultdict(int)
+        self.stats_by_class = {priority_class: ClassStats() for priority_class in PriorityClass}
+        # Sorted by (priority, arrival); entries are (priority, seq, class, client, future)
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def _can_run(self, priority_class: PriorityClass, client_id: str) -> bool:
+        return (
+            self.active_total < self.total_slots
+            and self.active[priority_class] < self.class_limits[priority_class]
+            and self.client_active[(priority_class, client_id)] < self.client_limit
+        )
+
+    def _acquire(self, priority_class: PriorityClass, client_id: str):
+        self.active_total += 1
+        self.active[priority_class] += 1
+        self.client_active[(priority_class, client_id)] += 1
+
+    def _release(self, priority_class: PriorityClass, client_id: str):
+        self.active_total -= 1
+        self.active[priority_class] -= 1
+        self.client_active[(priority_class, client_id)] -= 1
+        if not self.client_active[(priority_class, client_id)]:
+            del self.client_active[(priority_class, client_id)]
+        self._dispatch()
+
+    def _dequeue(self, priority_class: PriorityClass, client_id: str):
+        self.queued[priority_class] -= 1
+        self.client_queued[(priority_class, client_id)] -= 1
+        if not self.client_queued[(priority_class, client_id)]:
+            del self.client_queued[(priority_class, client_id)]
+
+    def _dispatch(self):
+        """Hand freed slots to the highest-priority waiters that fit"""
+        for waiter in list(self._waiters):
+            if self.active_total >= self.total_slots:
+                break
+            _, _, priority_class, client_id, future = waiter
+            if future.done() or not self._can_run(priority_class, client_id):
+                continue
+            self._waiters.remove(waiter)
+            self._dequeue(priority_class, client_id)
+            self._acquire(priority_class, client_id)
+            future.set_result(None)
+
+    def _retry_after(self, priority_class: PriorityClass) -> int:
+        stats = self.stats_by_class[priority_class]
+        backlog = self.queued[priority_class] + 1
+        return max(1, math.ceil(stats.avg_service_time * backlog / self.class_limits[priority_class]))
+
+    @asynccontextmanager
+    async def slot(self, priority_class: PriorityClass, client_id: str):
+        """Hold a work slot for the duration of the block"""
+        stats = self.stats_by_class[priority_class]
+        enqueued_at = time.monotonic()
+
+        # Every dispatch admits all waiters that fit, so whoever is still queued
+        # is held back by a limit this request is not; let it run if it can
+        if self._can_run(priority_class, client_id):
+            self._acquire(priority_class, client_id)
+        else:
+            if (self.queued[priority_class] >= self.queue_limits[priority_class]
+                    or self.client_queued[(priority_class, client_id)] >= self.client_queue_limit):
+                stats.rejected += 1
+                raise AdmissionRejected(priority_class, self._retry_after(priority_class))
+
+            future = asyncio.get_running_loop().create_future()
+            waiter = (PRIORITY_ORDER[priority_class], next(self._sequence), priority_class, client_id, future)
+            bisect.insort(self._waiters, waiter, key=lambda entry: entry[:2])
+            self.queued[priority_class] += 1
+            self.client_queued[(priority_class, client_id)] += 1
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Slot was granted just as the request went away
+                    self._release(priority_class, client_id)
+                else:
+                    self._waiters.remove(waiter)
+                    self._dequeue(priority_class, client_id)
+                raise
+
+        started_at = time.monotonic()
+        stats.record_wait(started_at - enqueued_at)
+        try:
+            yield
+        finally:
+            stats.record_service(time.monotonic() - started_at)
+            self._release(priority_class, client_id)
+
+    def stats(self) -> dict:
+        return {
+            priority_class.value: {
+                "active": self.active[priority_class],
+                "queued": self.queued[priority_class],
+                "limit": self.class_limits[priority_class],
+                "queue_limit": self.queue_limits[priority_class],
+                "admitted": stats.admitted,
+                "rejected": stats.rejected,
+                "avg_queue_wait_seconds": stats.total_wait / stats.admitted if stats.admitted else 0.0,
+                "max_queue_wait_seconds": stats.max_wait,
+                "avg_service_seconds": stats.avg_service_time,
+            }
+            for priority_class, stats in self.stats_by_class.items()
+        }
+
+admission_controller = AdmissionController(
+    total_slots=settings.admission_total_slots,
+    class_limits={
+        PriorityClass.INTERACTIVE: settings.admission_interactive_limit,
+        PriorityClass.UPLOAD: settings.admission_upload_limit,
+        PriorityClass.BULK: settings.admission_bulk_limit,
+    },
+    queue_limits={
+        PriorityClass.INTERACTIVE: settings.admission_interactive_queue,
+        PriorityClass.UPLOAD: settings.admission_upload_queue,
+        PriorityClass.BULK: settings.admission_bulk_queue,
+    },
+    client_limit=settings.admission_client_limit,
+    client_queue_limit=settings.admission_client_queue
+)
@@ -1,6 +1,7 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from app.utils.file_handler import FileHandler
 from app.config import get_settings
+import asyncio
 
 settings = get_settings()
 
@@ -17,22 +18,26 @@ class DocumentProcessor:
         """
         Process document: extract text, validate, and chunk
         Returns: (text, page_count, chunks)
+        
+        Extraction and chunking run in a worker thread so queries keep being
+        served on the event loop while a large document is processed.
         """
         # Extract text based on file type
         if filename.lower().endswith('.pdf'):
-            text, page_count = self.file_handler.extract_text_from_pdf(file_path)
+            extract = self.file_handler.extract_text_from_pdf
         elif filename.lower().endswith('.docx'):
-            text, page_count = self.file_handler.extract_text_from_docx(file_path)
+            extract = self.file_handler.extract_text_from_docx
         elif filename.lower().endswith('.txt'):
-            text, page_count = self.file_handler.extract_text_from_txt(file_path)
+            extract = self.file_handler.extract_text_from_txt
         else:
             raise ValueError("Unsupported file format")
+        text, page_count = await asyncio.to_thread(extract, file_path)
         
         # Validate page count
         if page_count > settings.max_pages_per_doc:
             raise ValueError(f"Document exceeds maximum page limit of {settings.max_pages_per_doc}")
         
         # Chunk the text
-        chunks = self.text_splitter.split_text(text)
+        chunks = await asyncio.to_thread(self.text_splitter.split_text, text)
         
         return text, page_count, chunks
\ No newline at end of file
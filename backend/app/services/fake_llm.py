@@ -0,0 +1,31 @@
+from typing import Optional
+import threading
+import time
+
+class FakeLLMResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+class FakeLLM:
+    """Local stand-in for the chat model with configurable latency.
+
+    Mirrors the blocking `invoke(prompt)` interface of the LangChain client so
+    the governor and RAG pipeline can be exercised without calling Gemini.
+    Pass `error` to simulate provider failures such as rate limiting.
+    """
+
+    def __init__(self, latency: float = 0.0, answer: str = "This is a fake answer.",
+                 error: Optional[Exception] = None):
+        self.latency = latency
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str) -> FakeLLMResponse:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return FakeLLMResponse(self.answer)
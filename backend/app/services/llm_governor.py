@@ -0,0 +1,97 @@
+from langchain_google_genai import ChatGoogleGenerativeAI
+from app.services.fake_llm import FakeLLM
+from app.config import get_settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Optional
+import asyncio
+
+settings = get_settings()
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when an LLM call does not finish within its deadline"""
+
+class LLMOverloadedError(RuntimeError):
+    """Raised when too many LLM calls are already running or queued"""
+
+class LLMGovernor:
+    """Coalesces, limits and times out calls to a blocking LLM client.
+
+    Identical prompts that are in flight at the same time share one call.
+    At most `max_concurrency` calls run at once and up to `max_queue` more
+    wait for a slot; anything beyond that is rejected immediately. A caller
+    whose deadline passes stops waiting, but the underlying call keeps its
+    slot until it returns so the concurrency cap holds against the provider.
+    Calls run on the governor's own threads, so a slow provider cannot tie
+    up the default executor used for embedding, Chroma and text extraction.
+    """
+
+    def __init__(self, llm, max_concurrency: int, max_queue: int, timeout: float):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._pending = 0
+        self.coalesced = 0
+
+    async def _call(self, prompt: str):
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, self.llm.invoke, prompt)
+        finally:
+            self._pending -= 1
+
+    def _finish(self, prompt: str, call: asyncio.Future):
+        if self._in_flight.get(prompt) is call:
+            del self._in_flight[prompt]
+        # Mark the exception as retrieved when every waiter has timed out
+        if not call.cancelled():
+            call.exception()
+
+    async def invoke(self, prompt: str, timeout: Optional[float] = None):
+        """Return the LLM response for `prompt`, sharing any identical in-flight call"""
+        call = self._in_flight.get(prompt)
+        if call is None:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                raise LLMOverloadedError("Too many LLM calls in progress")
+            self._pending += 1
+            call = asyncio.ensure_future(self._call(prompt))
+            self._in_flight[prompt] = call
+            call.add_done_callback(partial(self._finish, prompt))
+        else:
+            self.coalesced += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError("LLM call exceeded its deadline")
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "in_flight": len(self._in_flight),
+            "coalesced": self.coalesced
+        }
+
+def create_llm():
+    if settings.llm_provider == "fake":
+        return FakeLLM(latency=settings.fake_llm_latency_seconds)
+
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash-exp",  # Updated to Gemini 2.5 Flash
+        google_api_key=settings.gemini_api_key,
+        temperature=0.4
+    )
+
+@lru_cache()
+def get_llm_governor():
+    return LLMGovernor(
+        create_llm(),
+        max_concurrency=settings.llm_max_concurrency,
+        max_queue=settings.llm_max_queue,
+        timeout=settings.llm_timeout_seconds
+    )
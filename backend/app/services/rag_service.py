@@ -1,19 +1,30 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.services.vector_store import VectorStore
+from app.services.vector_client import get_vector_store
+from app.services.llm_governor import get_llm_governor, LLMGovernor
+from app.services.session_store import session_store, ConversationSession
+from app.database import get_database
 from app.config import get_settings
 from typing import Optional, List
 import re
 
 settings = get_settings()
 
+# Follow-ups are short and either open with a continuation or refer back with
+# a pronoun early on ("is it mandatory?"); longer questions stand on their own
+FOLLOW_UP_MAX_WORDS = 10
+FOLLOW_UP_OPENER = re.compile(r"^(and|also|but|then|what about|how about|what else|and what about)\b")
+FOLLOW_UP_PRONOUN = re.compile(r"^(\S+\s+){0,2}(it|its|they|them|their|those|he|she|him|her)\b")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def looks_like_follow_up(query: str) -> bool:
+    q = query.strip().lower()
+    if len(q.split()) > FOLLOW_UP_MAX_WORDS:
+        return False
+    return bool(FOLLOW_UP_OPENER.search(q) or FOLLOW_UP_PRONOUN.search(q))
+
 class RAGService:
-    def __init__(self):
-        self.vector_store = VectorStore()
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",  # Updated to Gemini 2.5 Flash
-            google_api_key=settings.gemini_api_key,
-            temperature=0.4
-        )
+    def __init__(self, llm_governor: Optional[LLMGovernor] = None):
+        self.vector_store = get_vector_store()
+        self.llm_governor = llm_governor or get_llm_governor()
     
     def _handle_small_talk(self, query: str) -> Optional[str]:
         """Return a friendly, human response for small‑talk style queries.
@@ -54,40 +65,136 @@ class RAGService:
         
         return None
     
-    async def query(self, query: str, document_ids: Optional[List[str]] = None, top_k: int = 5):
-        """Execute RAG pipeline with a conversational fallback."""
+    @staticmethod
+    def _retrieval_only_answer(contexts: List[str]) -> str:
+        """Answer built from the retrieved passages when the LLM is unavailable"""
+        passages = "\n".join(
+            f"- {ctx[:300].strip()}{'...' if len(ctx) > 300 else ''}"
+            for ctx in contexts[:3]
+        )
+        return (
+            "I couldn't generate a full answer right now, but these passages from your "
+            f"documents look most relevant:\n\n{passages}"
+        )
+    
+    @staticmethod
+    def _format_history(session: ConversationSession) -> str:
+        return "\n".join(
+            f"User: {turn['query']}\nAssistant: {turn['answer'][:500]}"
+            for turn in session.turns
+        )
+    
+    async def _rewrite_follow_up(self, query: str, session: Optional[ConversationSession]) -> str:
+        """Rewrite a follow-up question into a standalone search query.
+
+        Only queries that look like they depend on earlier turns are sent to
+        the LLM; anything else, a failed rewrite, or a rewrite that adds
+        nothing from earlier turns is returned unchanged.
+        """
+        if session is None or not session.turns or not looks_like_follow_up(query):
+            return query
+        
+        prompt = f"""Rewrite the user's latest question as a single standalone question that can be understood without the conversation. 
+Keep names, section numbers and terms from the conversation. Reply with the rewritten question only.
+
+Conversation:
+{self._format_history(session)}
+
+Latest question: {query}
+"""
+        try:
+            response = await self.llm_governor.invoke(prompt, timeout=settings.llm_rewrite_timeout_seconds)
+        except Exception:
+            return query
+        
+        rewritten = response.content.strip().strip('"').strip()
+        return rewritten if self._adds_context(query, rewritten, session) else query
+    
+    @staticmethod
+    def _adds_context(query: str, rewritten: str, session: ConversationSession) -> bool:
+        """Whether the rewrite brought in terms from earlier turns rather than just rephrasing"""
+        def words(text: str) -> set:
+            # Short words are mostly articles and pronouns
+            return {word for word in WORD_PATTERN.findall(text.lower()) if len(word) > 3}
+        
+        history = set()
+        for turn in session.turns:
+            history |= words(turn["query"]) | words(turn["answer"])
+        return bool((words(rewritten) - words(query)) & history)
+    
+    async def query(self, query: str, document_ids: Optional[List[str]] = None, top_k: int = 5,
+                    session_id: Optional[str] = None, start_session: bool = False):
+        """Execute RAG pipeline with a conversational fallback.
+
+        Queries are stateless unless the caller passes a `session_id` or asks
+        to `start_session`; only then are turns and retrieved chunks kept. An
+        unknown or expired `session_id` starts a new session under a new id,
+        so the caller can tell the earlier context is gone.
+        """
+        db, session = None, None
+        if session_id or start_session:
+            db = get_database()
+            if session_id:
+                session = await session_store.get(db, session_id)
+            if session is None:
+                session = await session_store.create(db)
+        session_id = session.session_id if session else None
+        
         # 0. Friendly small‑talk handling
         small_talk = self._handle_small_talk(query)
         if small_talk is not None:
-            return {"answer": small_talk, "sources": []}
+            return {"answer": small_talk, "sources": [], "session_id": session_id}
+        
+        # 1. Turn follow-ups into standalone queries
+        search_query = await self._rewrite_follow_up(query, session)
+        rewritten_query = search_query if search_query != query else None
         
-        # 1. Retrieve relevant chunks
-        search_results = await self.vector_store.search(query, document_ids, top_k)
+        # 2. Retrieve relevant chunks, reusing ones this session already fetched
+        cached = session.get_retrieval(search_query, document_ids, top_k) if session else None
+        if cached is not None:
+            ids, contexts, metadatas = cached
+        else:
+            search_results = await self.vector_store.search(search_query, document_ids, top_k)
+            ids = search_results['ids'][0]
+            contexts = search_results['documents'][0]
+            metadatas = search_results['metadatas'][0]
+            if session:
+                session.put_retrieval(search_query, document_ids, top_k, ids, contexts, metadatas)
         
-        if not search_results['documents'][0]:
+        # A follow-up also gets the chunks the previous answer was built from
+        if rewritten_query:
+            for chunk_id, context, metadata in zip(*session.previous_turn_chunks()):
+                if chunk_id not in ids and (not document_ids or metadata.get("document_id") in document_ids):
+                    ids = ids + [chunk_id]
+                    contexts = contexts + [context]
+                    metadatas = metadatas + [metadata]
+        
+        if not contexts:
             return {
                 "answer": (
                     "I couldn't find anything in your documents that answers that directly. "
                     "You can try asking about a specific topic or phrase, upload another file, "
                     "or increase the 'Top k' setting to search more snippets."
                 ),
-                "sources": []
+                "sources": [],
+                "session_id": session_id,
+                "rewritten_query": rewritten_query
             }
         
-        # 2. Prepare context from retrieved chunks
-        contexts = search_results['documents'][0]
-        metadatas = search_results['metadatas'][0]
-        
+        # 3. Prepare context from retrieved chunks
         context_text = "\n\n".join([f"[{i+1}] {ctx}" for i, ctx in enumerate(contexts)])
+        history_text = ""
+        if session and session.turns:
+            history_text = f"\nConversation so far:\n{self._format_history(session)}\n"
         
-        # 3. Create prompt
+        # 4. Create prompt
         prompt = f"""You are a friendly, helpful assistant answering questions about the user's uploaded documents. 
 Write naturally and clearly in a conversational tone, but stay faithful to the provided context.
 
 Context (snippets from the user's documents):
 {context_text}
-
-User question: {query}
+{history_text}
+User question: {search_query}
 
 Instructions:
 - Answer directly and concisely, using bullet points or short paragraphs when helpful.
@@ -95,10 +202,19 @@ Instructions:
 - If the context is insufficient, say politely that the documents don't contain enough information and suggest what to ask next.
 """
         
-        # 4. Generate response
-        response = self.llm.invoke(prompt)
+        # 5. Generate response, falling back to the retrieved passages
+        degraded = False
+        try:
+            response = await self.llm_governor.invoke(prompt)
+            answer = response.content
+            if session:
+                await session_store.add_turn(db, session, query, answer, ids, contexts, metadatas)
+        except Exception:
+            # Deadline, overload or provider errors such as rate limits
+            answer = self._retrieval_only_answer(contexts)
+            degraded = True
         
-        # 5. Format sources
+        # 6. Format sources
         sources = [
             {
                 "content": contexts[i][:200] + "..." if len(contexts[i]) > 200 else contexts[i],
@@ -110,6 +226,9 @@ Instructions:
         ]
         
         return {
-            "answer": response.content,
-            "sources": sources
+            "answer": answer,
+            "sources": sources,
+            "session_id": session_id,
+            "rewritten_query": rewritten_query,
+            "degraded": degraded
         }
\ No newline at end of file
@@ -0,0 +1,214 @@
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Optional, List
+from app.database import get_documents_version
+from app.config import get_settings
+import time
+import uuid
+
+settings = get_settings()
+
+class ConversationSession:
+    """Recent turns of a chat session plus this worker's cache of its retrieved chunks"""
+
+    def __init__(self, session_id: str, turns: Optional[List[dict]] = None):
+        self.session_id = session_id
+        # Each turn keeps the chunks its answer was built from
+        self.turns = deque(turns or [], maxlen=settings.session_max_turns)
+        # chunk id -> (content, metadata), least recently used first
+        self.chunks = OrderedDict()
+        # (normalized query, document ids) -> (top_k, chunk ids)
+        self.retrievals = OrderedDict()
+        self.cached_chars = 0
+        # Documents version the cached chunks were retrieved at
+        self.documents_version = None
+        self.last_access = time.monotonic()
+
+    @staticmethod
+    def _retrieval_key(query: str, document_ids: Optional[List[str]]) -> tuple:
+        normalized = " ".join(query.lower().split())
+        return normalized, tuple(sorted(document_ids)) if document_ids else None
+
+    def add_turn(self, query: str, answer: str, ids: List[str], contexts: List[str], metadatas: List[dict]) -> dict:
+        turn = {
+            "query": query,
+            "answer": answer,
+            "chunks": [
+                {"id": chunk_id, "content": content, "metadata": metadata}
+                for chunk_id, content, metadata in zip(ids, contexts, metadatas)
+            ]
+        }
+        self.turns.append(turn)
+        return turn
+
+    def get_chunks(self, chunk_ids: List[str]) -> tuple[List[str], List[str], List[dict]]:
+        """Return (ids, contexts, metadatas) for the given chunks still held in the session"""
+        ids, contexts, metadatas = [], [], []
+        for chunk_id in chunk_ids:
+            if chunk_id in self.chunks:
+                self.chunks.move_to_end(chunk_id)
+                content, metadata = self.chunks[chunk_id]
+                ids.append(chunk_id)
+                contexts.append(content)
+                metadatas.append(metadata)
+        return ids, contexts, metadatas
+
+    def previous_turn_chunks(self) -> tuple[List[str], List[str], List[dict]]:
+        """Chunks behind the last answer, which a follow-up most likely refers to"""
+        chunks = self.turns[-1]["chunks"] if self.turns else []
+        return (
+            [chunk["id"] for chunk in chunks],
+            [chunk["content"] for chunk in chunks],
+            [chunk["metadata"] for chunk in chunks]
+        )
+
+    def get_retrieval(self, query: str, document_ids: Optional[List[str]], top_k: int):
+        """Return cached (ids, contexts, metadatas) if they cover the requested top_k"""
+        key = self._retrieval_key(query, document_ids)
+        cached = self.retrievals.get(key)
+        if cached is None:
+            return None
+
+        cached_top_k, chunk_ids = cached
+        # A result shorter than its top_k already holds every matching chunk
+        if cached_top_k < top_k and len(chunk_ids) >= cached_top_k:
+            return None
+
+        chunk_ids = chunk_ids[:top_k]
+        if any(chunk_id not in self.chunks for chunk_id in chunk_ids):
+            del self.retrievals[key]
+            return None
+
+        self.retrievals.move_to_end(key)
+        return self.get_chunks(chunk_ids)
+
+    def put_retrieval(self, query: str, document_ids: Optional[List[str]], top_k: int,
+                      ids: List[str], contexts: List[str], metadatas: List[dict]):
+        for chunk_id, content, metadata in zip(ids, contexts, metadatas):
+            if chunk_id in self.chunks:
+                self.chunks.move_to_end(chunk_id)
+            else:
+                self.chunks[chunk_id] = (content, metadata)
+                self.cached_chars += len(content)
+
+        key = self._retrieval_key(query, document_ids)
+        self.retrievals.pop(key, None)
+        self.retrievals[key] = (top_k, list(ids))
+
+        # Evict the least recently used chunks once over the memory budget;
+        # retrievals that lose a chunk become cache misses
+        while self.cached_chars > settings.session_max_cached_chars and len(self.chunks) > len(ids):
+            _, (content, _) = self.chunks.popitem(last=False)
+            self.cached_chars -= len(content)
+
+    def sync_documents_version(self, version: int):
+        """Drop cached search results if documents changed since they were retrieved.
+
+        Any worker may have uploaded or deleted a document in the meantime; the
+        shared documents version is how this worker finds out.
+        """
+        if self.documents_version != version:
+            self.chunks.clear()
+            self.retrievals.clear()
+            self.cached_chars = 0
+            self.documents_version = version
+
+    def invalidate_document(self, document_id: str):
+        """Drop cached chunks that belong to a document"""
+        for chunk_id, (content, metadata) in list(self.chunks.items()):
+            if metadata.get("document_id") == document_id:
+                del self.chunks[chunk_id]
+                self.cached_chars -= len(content)
+        for turn in self.turns:
+            turn["chunks"] = [chunk for chunk in turn["chunks"] if chunk["metadata"].get("document_id") != document_id]
+
+class SessionStore:
+    """Conversation sessions shared by all API workers.
+
+    Turns are stored in MongoDB, so a follow-up can land on any worker and
+    sessions expire after `session_ttl_seconds` of inactivity. Each worker
+    also keeps an LRU- and TTL-bounded cache of sessions it has served, which
+    holds their retrieved chunks.
+    """
+
+    def __init__(self):
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+
+    @staticmethod
+    def _expires_at() -> datetime:
+        return datetime.utcnow() + timedelta(seconds=settings.session_ttl_seconds)
+
+    async def ensure_indexes(self, db):
+        # MongoDB removes expired sessions in the background
+        await db.conversation_sessions.create_index("expires_at", expireAfterSeconds=0)
+
+    def _evict_expired(self):
+        cutoff = time.monotonic() - settings.session_ttl_seconds
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            if oldest.last_access >= cutoff:
+                break
+            self.sessions.popitem(last=False)
+
+    async def _cache(self, db, session_id: str, turns: List[dict]) -> ConversationSession:
+        self._evict_expired()
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id)
+            self.sessions[session_id] = session
+            while len(self.sessions) > settings.max_sessions:
+                self.sessions.popitem(last=False)
+        session.turns = deque(turns, maxlen=settings.session_max_turns)
+        session.sync_documents_version(await get_documents_version(db))
+
+        session.last_access = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    async def create(self, db) -> ConversationSession:
+        session_id = str(uuid.uuid4())
+        await db.conversation_sessions.insert_one({
+            "_id": session_id,
+            "turns": [],
+            "expires_at": self._expires_at()
+        })
+        return await self._cache(db, session_id, [])
+
+    async def get(self, db, session_id: str) -> Optional[ConversationSession]:
+        """Return the session, or None if it never existed or has expired"""
+        doc = await db.conversation_sessions.find_one_and_update(
+            {"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}},
+            {"$set": {"expires_at": self._expires_at()}}
+        )
+        if doc is None:
+            self.sessions.pop(session_id, None)
+            return None
+        return await self._cache(db, session_id, doc["turns"])
+
+    async def add_turn(self, db, session: ConversationSession, query: str, answer: str,
+                       ids: List[str], contexts: List[str], metadatas: List[dict]):
+        turn = session.add_turn(query, answer, ids, contexts, metadatas)
+        await db.conversation_sessions.update_one(
+            {"_id": session.session_id},
+            {
+                "$push": {"turns": {"$each": [turn], "$slice": -settings.session_max_turns}},
+                "$set": {"expires_at": self._expires_at()}
+            }
+        )
+
+    async def delete(self, db, session_id: str) -> bool:
+        self.sessions.pop(session_id, None)
+        result = await db.conversation_sessions.delete_one({"_id": session_id})
+        return result.deleted_count > 0
+
+    async def invalidate_document(self, db, document_id: str):
+        """Drop a deleted document's chunks from every session"""
+        for session in self.sessions.values():
+            session.invalidate_document(document_id)
+        await db.conversation_sessions.update_many(
+            {"turns.chunks.metadata.document_id": document_id},
+            {"$pull": {"turns.$[].chunks": {"metadata.document_id": document_id}}}
+        )
+
+session_store = SessionStore()
@@ -0,0 +1,211 @@
+from app.services.vector_client import get_vector_store, RemoteVectorStore
+from app.services.session_store import session_store
+from app.database import connect_to_mongo, close_mongo_connection, get_database, bump_documents_version
+from app.config import get_settings
+from datetime import datetime
+from typing import Optional
+import numpy as np
+import asyncio
+import os
+import hashlib
+import json
+import struct
+import time
+import zlib
+
+settings = get_settings()
+
+# File layout:
+#   preamble   magic, format version, header length (little endian)
+#   header     UTF-8 JSON: counts, dimensions, section sizes, sha256 of the body
+#   body       float32 embeddings as one contiguous row-major (count x dim) array,
+#              followed by zlib-compressed JSON with ids, chunk text, metadata,
+#              document records and deleted document ids
+SNAPSHOT_MAGIC = b"QYDSNAP\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<8sII")
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is malformed or fails verification"""
+
+class SnapshotService:
+    def __init__(self):
+        self.vector_store = get_vector_store()
+
+    async def export_snapshot(self, db, since: Optional[float] = None) -> tuple[bytes, float]:
+        """Serialize chunks, embeddings and document records ingested after `since`
+
+        Returns (snapshot bytes, snapshot time); pass the time as `since` on the
+        next export to get an incremental snapshot.
+        """
+        created_at = time.time()
+
+        ids, chunks, metadatas, embedding_batches = [], [], [], []
+        offset = 0
+        while True:
+            batch = await self.vector_store.get_chunks(since, offset, settings.snapshot_batch_size)
+            if not batch["ids"]:
+                break
+            ids.extend(batch["ids"])
+            chunks.extend(batch["documents"])
+            metadatas.extend(batch["metadatas"])
+            embedding_batches.append(await asyncio.to_thread(np.asarray, batch["embeddings"], "<f4"))
+            offset += len(batch["ids"])
+
+        document_filter, tombstone_filter = {}, {}
+        if since is not None:
+            since_date = datetime.utcfromtimestamp(since)
+            # Records written before updated_at existed fall back to upload_date
+            document_filter = {"$or": [
+                {"updated_at": {"$gt": since_date}},
+                {"updated_at": {"$exists": False}, "upload_date": {"$gt": since_date}}
+            ]}
+            tombstone_filter = {"deleted_at": {"$gt": since_date}}
+
+        documents = await db.documents.find(document_filter).to_list(None)
+        for doc in documents:
+            for field in ("upload_date", "updated_at"):
+                if field in doc:
+                    doc[field] = doc[field].isoformat()
+        tombstones = await db.document_tombstones.find(tombstone_filter).to_list(None)
+
+        records = {
+            "ids": ids,
+            "chunks": chunks,
+            "metadatas": metadatas,
+            "documents": documents,
+            "deleted_document_ids": [tombstone["_id"] for tombstone in tombstones]
+        }
+        # Concatenating, compressing and hashing are CPU-bound; keep them off the event loop
+        data = await asyncio.to_thread(self._encode_snapshot, created_at, since, embedding_batches, records)
+        return data, created_at
+
+    @staticmethod
+    def _encode_snapshot(created_at: float, since: Optional[float], embedding_batches: list, records: dict) -> bytes:
+        if embedding_batches:
+            embeddings = np.ascontiguousarray(np.concatenate(embedding_batches))
+        else:
+            embeddings = np.zeros((0, 0), dtype="<f4")
+
+        embeddings_bytes = embeddings.tobytes()
+        records_bytes = zlib.compress(json.dumps(records).encode("utf-8"))
+        body = embeddings_bytes + records_bytes
+
+        header = json.dumps({
+            "created_at": created_at,
+            "since": since,
+            "count": len(records["ids"]),
+            "dim": int(embeddings.shape[1]),
+            "dtype": "float32",
+            "embeddings_bytes": len(embeddings_bytes),
+            "records_bytes": len(records_bytes),
+            "sha256": hashlib.sha256(body).hexdigest()
+        }).encode("utf-8")
+
+        return PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)) + header + body
+
+    @staticmethod
+    def read_snapshot(data: bytes) -> tuple[dict, np.ndarray, dict]:
+        """Verify a snapshot and return (header, embeddings, records)"""
+        if len(data) < PREAMBLE.size:
+            raise SnapshotError("Snapshot is truncated")
+
+        magic, version, header_length = PREAMBLE.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not a snapshot file")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format version {version}")
+
+        header_end = PREAMBLE.size + header_length
+        try:
+            header = json.loads(data[PREAMBLE.size:header_end].decode("utf-8"))
+            count, dim = int(header["count"]), int(header["dim"])
+            embeddings_bytes, records_bytes = int(header["embeddings_bytes"]), int(header["records_bytes"])
+            checksum = header["sha256"]
+        except (UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+            raise SnapshotError(f"Corrupt snapshot header: {e}")
+
+        # The header is outside the checksum, so check its sizes against each other
+        if count < 0 or dim < 0 or count * dim * 4 != embeddings_bytes:
+            raise SnapshotError("Snapshot header does not match its embeddings")
+
+        body = memoryview(data)[header_end:]
+        if len(body) != embeddings_bytes + records_bytes:
+            raise SnapshotError("Snapshot is truncated")
+        if hashlib.sha256(body).hexdigest() != checksum:
+            raise SnapshotError("Snapshot checksum mismatch")
+
+        embeddings = np.frombuffer(body[:embeddings_bytes], dtype="<f4").reshape(count, dim)
+        try:
+            records = json.loads(zlib.decompress(body[embeddings_bytes:]).decode("utf-8"))
+            record_count = len(records["ids"])
+        except (zlib.error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+            raise SnapshotError(f"Corrupt snapshot records: {e}")
+        if record_count != count:
+            raise SnapshotError("Snapshot records do not match its embeddings")
+
+        return header, embeddings, records
+
+    async def import_snapshot(self, db, data: bytes) -> dict:
+        """Bulk load a snapshot, applying its deletions before its chunks"""
+        header, embeddings, records = await asyncio.to_thread(self.read_snapshot, data)
+
+        deleted_ids = records["deleted_document_ids"]
+        for document_id in deleted_ids:
+            await self.vector_store.delete_document(document_id)
+            await session_store.invalidate_document(db, document_id)
+        if deleted_ids:
+            await db.documents.delete_many({"_id": {"$in": deleted_ids}})
+
+        ids = records["ids"]
+        batch_size = settings.snapshot_batch_size
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            await self.vector_store.upsert_chunks(
+                ids=ids[start:end],
+                embeddings=await asyncio.to_thread(embeddings[start:end].tolist),
+                chunks=records["chunks"][start:end],
+                metadatas=records["metadatas"][start:end]
+            )
+
+        for doc in records["documents"]:
+            for field in ("upload_date", "updated_at"):
+                if field in doc:
+                    doc[field] = datetime.fromisoformat(doc[field])
+            await db.documents.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+
+        return {
+            "snapshot_time": header["created_at"],
+            "chunk_count": len(ids),
+            "document_count": len(records["documents"]),
+            "deleted_document_count": len(deleted_ids)
+        }
+
+async def bootstrap_from_snapshot(db, path: str) -> bool:
+    """Seed an empty index from a snapshot file instead of re-ingesting documents"""
+    if not path or not os.path.exists(path):
+        return False
+
+    snapshot_service = SnapshotService()
+    if await snapshot_service.vector_store.count() > 0:
+        return False
+
+    with open(path, "rb") as f:
+        await snapshot_service.import_snapshot(db, f.read())
+    await bump_documents_version(db)
+    return True
+
+async def bootstrap():
+    await connect_to_mongo()
+    try:
+        await bootstrap_from_snapshot(get_database(), settings.snapshot_bootstrap_path)
+    finally:
+        vector_store = get_vector_store()
+        if isinstance(vector_store, RemoteVectorStore):
+            await vector_store.close()
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    # Run once by start.sh before the API workers start, so they do not
+    # each import the same snapshot through the shared vector service
+    asyncio.run(bootstrap())
@@ -0,0 +1,120 @@
+from app.services.vector_protocol import (
+    encode_frame, read_frame, VectorServiceError, STATUS_ERROR,
+    OP_SEARCH, OP_ADD_DOCUMENT, OP_DELETE_DOCUMENT, OP_COUNT, OP_GET_CHUNKS, OP_UPSERT_CHUNKS
+)
+from app.config import get_settings
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+import asyncio
+
+settings = get_settings()
+
+class RemoteVectorStore:
+    """VectorStore interface backed by the shared vector service process.
+
+    API workers using this never import the embedding model or open Chroma,
+    so adding workers only adds the cost of a small connection pool.
+    """
+
+    def __init__(self, socket_path: str, pool_size: int = 8):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _exchange(self, connection, frame: bytes):
+        reader, writer = connection
+        writer.write(frame)
+        await writer.drain()
+        return await read_frame(reader)
+
+    async def _request(self, op: int, payload: dict, blob: bytes = b"") -> tuple[dict, bytes]:
+        frame = encode_frame(op, payload, blob)
+
+        connection = self._idle.pop() if self._idle else None
+        try:
+            if connection is not None:
+                try:
+                    status, response, response_blob = await self._exchange(connection, frame)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # Pooled connection went stale, e.g. the service restarted
+                    connection[1].close()
+                    connection = None
+            if connection is None:
+                connection = await asyncio.open_unix_connection(self.socket_path)
+                status, response, response_blob = await self._exchange(connection, frame)
+        except BaseException:
+            if connection is not None:
+                connection[1].close()
+            raise
+
+        if len(self._idle) < self.pool_size:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+
+        if status == STATUS_ERROR:
+            raise VectorServiceError(response["error"])
+        return response, response_blob
+
+    async def close(self):
+        """Close pooled connections"""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+    async def add_document(self, document_id: str, chunks: List[str], metadata: dict):
+        """Add document chunks to vector store"""
+        await self._request(OP_ADD_DOCUMENT, {
+            "document_id": document_id,
+            "chunks": chunks,
+            "metadata": metadata
+        })
+
+    async def search(self, query: str, document_ids: Optional[List[str]] = None, top_k: int = 5):
+        """Search for relevant chunks"""
+        response, _ = await self._request(OP_SEARCH, {
+            "query": query,
+            "document_ids": document_ids,
+            "top_k": top_k
+        })
+        return response
+
+    async def delete_document(self, document_id: str):
+        """Delete all chunks of a document"""
+        await self._request(OP_DELETE_DOCUMENT, {"document_id": document_id})
+
+    async def count(self) -> int:
+        """Number of chunks in the collection"""
+        response, _ = await self._request(OP_COUNT, {})
+        return response["count"]
+
+    async def get_chunks(self, since: Optional[float] = None, offset: int = 0, limit: int = 1000):
+        """Page through stored chunks with their embeddings, optionally only those ingested after `since`"""
+        response, blob = await self._request(OP_GET_CHUNKS, {"since": since, "offset": offset, "limit": limit})
+        response["embeddings"] = np.frombuffer(blob, dtype="<f4").reshape(len(response["ids"]), response.pop("dim"))
+        return response
+
+    async def upsert_chunks(self, ids: List[str], embeddings: List[List[float]], chunks: List[str], metadatas: List[dict]):
+        """Write precomputed chunks and embeddings without re-embedding"""
+        embeddings = np.asarray(embeddings, dtype="<f4")
+        await self._request(OP_UPSERT_CHUNKS, {
+            "ids": ids,
+            "chunks": chunks,
+            "metadatas": metadatas,
+            "dim": embeddings.shape[1] if embeddings.ndim == 2 else 0
+        }, embeddings.tobytes())
+
+@lru_cache()
+def get_vector_store():
+    """Shared vector store for this process.
+
+    Talks to the vector service when VECTOR_SERVICE_SOCKET is set; otherwise
+    loads the embedding model and Chroma collection in-process, once.
+    """
+    if settings.vector_service_socket:
+        return RemoteVectorStore(settings.vector_service_socket, settings.vector_service_pool_size)
+
+    from app.services.vector_store import VectorStore
+    return VectorStore()
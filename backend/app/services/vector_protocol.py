@@ -0,0 +1,33 @@
+import asyncio
+import json
+import struct
+
+# Every message is a frame: code (1 byte), JSON length and blob length
+# (4 bytes each, little endian), the UTF-8 JSON payload, then an optional
+# binary blob. Embeddings travel in the blob as contiguous float32 rows so
+# they are never expanded into JSON numbers.
+FRAME_HEADER = struct.Struct("<BII")
+
+OP_SEARCH = 1
+OP_ADD_DOCUMENT = 2
+OP_DELETE_DOCUMENT = 3
+OP_COUNT = 4
+OP_GET_CHUNKS = 5
+OP_UPSERT_CHUNKS = 6
+
+STATUS_OK = 0
+STATUS_ERROR = 255
+
+class VectorServiceError(RuntimeError):
+    """Raised on the client when the vector service reports a failure"""
+
+def encode_frame(code: int, payload: dict, blob: bytes = b"") -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(code, len(body), len(blob)) + body + blob
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, dict, bytes]:
+    """Read one frame; raises asyncio.IncompleteReadError when the peer hangs up"""
+    code, body_length, blob_length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    payload = json.loads(await reader.readexactly(body_length)) if body_length else {}
+    blob = await reader.readexactly(blob_length) if blob_length else b""
+    return code, payload, blob
@@ -0,0 +1,95 @@
+from app.services.vector_store import VectorStore
+from app.services.vector_protocol import (
+    encode_frame, read_frame, STATUS_OK, STATUS_ERROR,
+    OP_SEARCH, OP_ADD_DOCUMENT, OP_DELETE_DOCUMENT, OP_COUNT, OP_GET_CHUNKS, OP_UPSERT_CHUNKS
+)
+from app.config import get_settings
+import numpy as np
+import asyncio
+import os
+
+settings = get_settings()
+
+class VectorServer:
+    """Serves one VectorStore (embedding model + Chroma collection) over a Unix socket.
+
+    Run it once per host with `python -m app.services.vector_server` and point
+    every API worker at the same VECTOR_SERVICE_SOCKET.
+    """
+
+    def __init__(self, vector_store: VectorStore):
+        self.vector_store = vector_store
+
+    async def dispatch(self, op: int, payload: dict, blob: bytes) -> tuple[dict, bytes]:
+        if op == OP_SEARCH:
+            results = await self.vector_store.search(payload["query"], payload.get("document_ids"), payload["top_k"])
+            return {
+                "ids": results["ids"],
+                "documents": results["documents"],
+                "metadatas": results["metadatas"],
+                "distances": results["distances"]
+            }, b""
+
+        if op == OP_ADD_DOCUMENT:
+            await self.vector_store.add_document(payload["document_id"], payload["chunks"], payload["metadata"])
+            return {}, b""
+
+        if op == OP_DELETE_DOCUMENT:
+            await self.vector_store.delete_document(payload["document_id"])
+            return {}, b""
+
+        if op == OP_COUNT:
+            return {"count": await self.vector_store.count()}, b""
+
+        if op == OP_GET_CHUNKS:
+            batch = await self.vector_store.get_chunks(payload.get("since"), payload["offset"], payload["limit"])
+            embeddings = np.asarray(batch["embeddings"] if batch["ids"] else [], dtype="<f4")
+            dim = embeddings.shape[1] if embeddings.ndim == 2 else 0
+            return {
+                "ids": batch["ids"],
+                "documents": batch["documents"],
+                "metadatas": batch["metadatas"],
+                "dim": dim
+            }, embeddings.tobytes()
+
+        if op == OP_UPSERT_CHUNKS:
+            embeddings = np.frombuffer(blob, dtype="<f4").reshape(len(payload["ids"]), payload["dim"])
+            await self.vector_store.upsert_chunks(
+                payload["ids"], embeddings.tolist(), payload["chunks"], payload["metadatas"]
+            )
+            return {}, b""
+
+        raise ValueError(f"Unknown operation {op}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    op, payload, blob = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    response, response_blob = await self.dispatch(op, payload, blob)
+                    writer.write(encode_frame(STATUS_OK, response, response_blob))
+                except Exception as e:
+                    writer.write(encode_frame(STATUS_ERROR, {"error": str(e)}))
+                await writer.drain()
+        finally:
+            writer.close()
+
+async def serve(socket_path: str):
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    vector_server = VectorServer(VectorStore())
+    server = await asyncio.start_unix_server(vector_server.handle_connection, path=socket_path)
+    os.chmod(socket_path, 0o660)
+
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    if not settings.vector_service_socket:
+        raise SystemExit("VECTOR_SERVICE_SOCKET is not set")
+    asyncio.run(serve(settings.vector_service_socket))
@@ -2,6 +2,8 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 from typing import List, Optional
 from app.config import get_settings
+import asyncio
+import time
 import uuid
 
 # Use sentence_transformers directly
@@ -36,12 +38,14 @@ class VectorStore:
     
     async def add_document(self, document_id: str, chunks: List[str], metadata: dict):
         """Add document chunks to vector store"""
-        embeddings = self._embed_documents(chunks)
+        embeddings = await asyncio.to_thread(self._embed_documents, chunks)
         
         ids = [f"{document_id}_{i}" for i in range(len(chunks))]
-        metadatas = [{**metadata, "chunk_index": i} for i in range(len(chunks))]
+        ingested_at = time.time()
+        metadatas = [{**metadata, "chunk_index": i, "ingested_at": ingested_at} for i in range(len(chunks))]
         
-        self.collection.add(
+        await asyncio.to_thread(
+            self.collection.add,
             ids=ids,
             embeddings=embeddings,
             documents=chunks,
@@ -50,13 +54,14 @@ class VectorStore:
     
     async def search(self, query: str, document_ids: Optional[List[str]] = None, top_k: int = 5):
         """Search for relevant chunks"""
-        query_embedding = self._embed_query(query)
+        query_embedding = await asyncio.to_thread(self._embed_query, query)
         
         where_filter = None
         if document_ids:
             where_filter = {"document_id": {"$in": document_ids}}
         
-        results = self.collection.query(
+        results = await asyncio.to_thread(
+            self.collection.query,
             query_embeddings=[query_embedding],
             n_results=top_k,
             where=where_filter
@@ -66,4 +71,32 @@ class VectorStore:
     
     async def delete_document(self, document_id: str):
         """Delete all chunks of a document"""
-        self.collection.delete(where={"document_id": document_id})
\ No newline at end of file
+        await asyncio.to_thread(self.collection.delete, where={"document_id": document_id})
+    
+    async def count(self) -> int:
+        """Number of chunks in the collection"""
+        return self.collection.count()
+    
+    async def get_chunks(self, since: Optional[float] = None, offset: int = 0, limit: int = 1000):
+        """Page through stored chunks with their embeddings, optionally only those ingested after `since`"""
+        where_filter = None
+        if since is not None:
+            where_filter = {"ingested_at": {"$gt": since}}
+        
+        return await asyncio.to_thread(
+            self.collection.get,
+            where=where_filter,
+            offset=offset,
+            limit=limit,
+            include=["embeddings", "documents", "metadatas"]
+        )
+    
+    async def upsert_chunks(self, ids: List[str], embeddings: List[List[float]], chunks: List[str], metadatas: List[dict]):
+        """Write precomputed chunks and embeddings without re-embedding"""
+        await asyncio.to_thread(
+            self.collection.upsert,
+            ids=ids,
+            embeddings=embeddings,
+            documents=chunks,
+            metadatas=metadatas
+        )
\ No newline at end of file
@@ -0,0 +1,25 @@
+#!/bin/sh
+set -e
+
+# With VECTOR_SERVICE_SOCKET set, one vector service process owns the embedding
+# model and Chroma index and every uvicorn worker talks to it over the socket.
+if [ -n "$VECTOR_SERVICE_SOCKET" ]; then
+    # A socket left over from a previous run would pass the wait below
+    # before the service has loaded the model
+    rm -f "$VECTOR_SERVICE_SOCKET"
+    python -m app.services.vector_server &
+    VECTOR_SERVICE_PID=$!
+    while [ ! -S "$VECTOR_SERVICE_SOCKET" ]; do
+        kill -0 "$VECTOR_SERVICE_PID" 2>/dev/null || exit 1
+        sleep 0.5
+    done
+
+    # Seed an empty index once here rather than in every worker's startup
+    if [ -n "$SNAPSHOT_BOOTSTRAP_PATH" ]; then
+        python -m app.services.snapshot
+    fi
+fi
+
+# Nothing restarts the vector service if it dies; /api/health reports it as
+# unhealthy (503) so the orchestrator can restart the container
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-1}"
@@ -0,0 +1,123 @@
+import asyncio
+import ipaddress
+import pytest
+from types import SimpleNamespace
+from app.api import dependencies
+from app.services.admission import AdmissionController, AdmissionRejected, PriorityClass
+
+def make_controller(total_slots=1, limit=1, queue=2, client_limit=1, client_queue=2):
+    return AdmissionController(
+        total_slots=total_slots,
+        class_limits={priority_class: limit for priority_class in PriorityClass},
+        queue_limits={priority_class: queue for priority_class in PriorityClass},
+        client_limit=client_limit,
+        client_queue_limit=client_queue
+    )
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_admitted_first():
+    """Test that queued queries run before queued ingestion work"""
+    controller = make_controller()
+    order = []
+    
+    async def run(priority_class, client_id):
+        async with controller.slot(priority_class, client_id):
+            order.append(priority_class)
+            await asyncio.sleep(0.01)
+    
+    async with controller.slot(PriorityClass.UPLOAD, "uploader"):
+        tasks = [
+            asyncio.create_task(run(PriorityClass.BULK, "a")),
+            asyncio.create_task(run(PriorityClass.UPLOAD, "b")),
+            asyncio.create_task(run(PriorityClass.INTERACTIVE, "c")),
+        ]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    
+    assert order == [PriorityClass.INTERACTIVE, PriorityClass.UPLOAD, PriorityClass.BULK]
+
+@pytest.mark.asyncio
+async def test_full_queue_is_shed_with_retry_after():
+    """Test load shedding once a class queue is full"""
+    controller = make_controller(queue=1)
+    
+    async with controller.slot(PriorityClass.BULK, "a"):
+        waiting = asyncio.create_task(controller.slot(PriorityClass.BULK, "b").__aenter__())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.slot(PriorityClass.BULK, "c"):
+                pass
+        assert exc_info.value.retry_after >= 1
+        waiting.cancel()
+    
+    assert controller.stats()["bulk"]["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_client_limit_does_not_block_other_clients():
+    """Test that one client at its limit leaves slots for others"""
+    controller = make_controller(total_slots=4, limit=4, client_limit=1)
+    
+    async with controller.slot(PriorityClass.INTERACTIVE, "busy"):
+        blocked = asyncio.create_task(controller.slot(PriorityClass.INTERACTIVE, "busy").__aenter__())
+        await asyncio.sleep(0)
+        
+        async with controller.slot(PriorityClass.INTERACTIVE, "other"):
+            assert controller.stats()["interactive"]["active"] == 2
+        
+        assert not blocked.done()
+        blocked.cancel()
+
+@pytest.mark.asyncio
+async def test_flooding_client_does_not_lock_out_others():
+    """Test that one client filling its share of the queue is shed while another still gets in"""
+    controller = make_controller(total_slots=8, limit=8, queue=64, client_limit=4, client_queue=8)
+    release = asyncio.Event()
+    
+    async def query(client_id):
+        async with controller.slot(PriorityClass.INTERACTIVE, client_id):
+            await release.wait()
+    
+    flood = [asyncio.create_task(query("abuser")) for _ in range(68)]
+    await asyncio.sleep(0)
+    
+    rejected = [task for task in flood if task.done() and isinstance(task.exception(), AdmissionRejected)]
+    assert len(rejected) == 68 - 4 - 8
+    
+    innocent = asyncio.create_task(query("innocent"))
+    await asyncio.sleep(0)
+    assert not innocent.done()
+    assert controller.stats()["interactive"]["active"] == 5
+    
+    release.set()
+    await asyncio.gather(innocent, *[task for task in flood if task not in rejected])
+
+def make_request(host, client_id=None):
+    headers = {"x-client-id": client_id} if client_id else {}
+    return SimpleNamespace(client=SimpleNamespace(host=host), headers=headers)
+
+def test_client_id_header_trusted_only_from_proxies(monkeypatch):
+    """Test that X-Client-ID is honoured from the frontend but not from other callers"""
+    monkeypatch.setattr(dependencies, "TRUSTED_PROXIES", [ipaddress.ip_network("172.16.0.0/12")])
+    
+    assert dependencies.get_client_id(make_request("172.18.0.3", "browser-1")) == "172.18.0.3:browser-1"
+    assert dependencies.get_client_id(make_request("203.0.113.9", "random")) == "203.0.113.9"
+
+@pytest.mark.asyncio
+async def test_frontend_sessions_get_separate_client_limits(monkeypatch):
+    """Test that browser sessions behind one frontend IP each get their own limit"""
+    monkeypatch.setattr(dependencies, "TRUSTED_PROXIES", [ipaddress.ip_network("172.16.0.0/12")])
+    controller = make_controller(total_slots=8, limit=8, queue=8, client_limit=4)
+    release = asyncio.Event()
+    
+    async def query(browser):
+        client_id = dependencies.get_client_id(make_request("172.18.0.3", browser))
+        async with controller.slot(PriorityClass.INTERACTIVE, client_id):
+            await release.wait()
+    
+    tasks = [asyncio.create_task(query(f"browser-{i}")) for i in range(8)]
+    await asyncio.sleep(0)
+    
+    assert controller.stats()["interactive"]["active"] == 8
+    release.set()
+    await asyncio.gather(*tasks)
\ No newline at end of file
@@ -35,4 +35,17 @@ async def test_upload_invalid_file():
         
         response = await client.post("/api/documents/upload", files=files)
         
-        assert response.status_code == 400
\ No newline at end of file
+        assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_documents_not_modified():
+    """Test conditional listing with the returned ETag"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/documents")
+        
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        
+        response = await client.get("/api/documents", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
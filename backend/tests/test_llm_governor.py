@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services.fake_llm import FakeLLM
+from app.services.llm_governor import LLMGovernor, LLMTimeoutError, LLMOverloadedError
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_coalesced():
+    """Test that concurrent identical prompts share one LLM call"""
+    llm = FakeLLM(latency=0.2)
+    governor = LLMGovernor(llm, max_concurrency=2, max_queue=10, timeout=5)
+    
+    responses = await asyncio.gather(*[governor.invoke("same prompt") for _ in range(5)])
+    
+    assert llm.calls == 1
+    assert all(response.content == llm.answer for response in responses)
+
+@pytest.mark.asyncio
+async def test_call_exceeding_deadline_times_out():
+    """Test that a slow LLM call raises once its deadline passes"""
+    governor = LLMGovernor(FakeLLM(latency=0.5), max_concurrency=1, max_queue=1, timeout=0.1)
+    
+    with pytest.raises(LLMTimeoutError):
+        await governor.invoke("slow prompt")
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_calls():
+    """Test backpressure once running and queued calls reach the limit"""
+    governor = LLMGovernor(FakeLLM(latency=0.3), max_concurrency=1, max_queue=1, timeout=5)
+    
+    running = [asyncio.create_task(governor.invoke(f"prompt {i}")) for i in range(2)]
+    await asyncio.sleep(0)
+    
+    with pytest.raises(LLMOverloadedError):
+        await governor.invoke("prompt 3")
+    
+    await asyncio.gather(*running)
+@pytest.mark.asyncio
+async def test_timed_out_calls_leave_default_executor_free():
+    """Test that LLM calls past their deadline do not hold threads other work needs"""
+    # As small as the default pool on a single-CPU host
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4))
+    governor = LLMGovernor(FakeLLM(latency=1), max_concurrency=4, max_queue=4, timeout=0.05)
+    
+    for i in range(4):
+        with pytest.raises(LLMTimeoutError):
+            await governor.invoke(f"slow prompt {i}")
+    
+    started = time.monotonic()
+    await asyncio.gather(*[asyncio.to_thread(time.sleep, 0.2) for _ in range(3)])
+    assert time.monotonic() - started < 0.4
@@ -18,6 +18,7 @@ async def test_query_documents():
         assert "query" in data
         assert "answer" in data
         assert "sources" in data
+        assert data["session_id"] is None
 
 @pytest.mark.asyncio
 async def test_health_check():
@@ -27,4 +28,43 @@ async def test_health_check():
         
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "healthy"
\ No newline at end of file
+        assert data["status"] == "healthy"
+
+@pytest.mark.asyncio
+async def test_query_session_follow_up():
+    """Test that follow-up queries reuse the returned session"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/queries",
+            json={"query": "What is the main topic?", "start_session": True}
+        )
+        
+        assert response.status_code == 200
+        session_id = response.json()["session_id"]
+        assert session_id
+        
+        response = await client.post(
+            "/api/queries",
+            json={"query": "What about its conclusion?", "session_id": session_id}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["session_id"] == session_id
+        
+        response = await client.delete(f"/api/queries/sessions/{session_id}")
+        assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_unknown_session_starts_a_new_one():
+    """Test that an expired or unknown session id is replaced rather than silently reused"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/queries",
+            json={"query": "What is the main topic?", "session_id": "no-such-session"}
+        )
+        
+        assert response.status_code == 200
+        session_id = response.json()["session_id"]
+        assert session_id and session_id != "no-such-session"
+        
+        await client.delete(f"/api/queries/sessions/{session_id}")
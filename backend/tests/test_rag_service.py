@@ -0,0 +1,76 @@
+import pytest
+from app.services import rag_service
+from app.services.fake_llm import FakeLLM
+from app.services.llm_governor import LLMGovernor
+from app.services.session_store import ConversationSession
+
+class StubVectorStore:
+    """Returns a fixed search result without loading the embedding model"""
+    
+    async def search(self, query, document_ids=None, top_k=5):
+        return {
+            "ids": [["doc_0"]],
+            "documents": [["The report is due on Friday."]],
+            "metadatas": [[{"document_id": "doc", "filename": "syllabus.txt", "chunk_index": 0}]],
+            "distances": [[0.1]]
+        }
+
+def make_service(monkeypatch, llm, timeout=5):
+    monkeypatch.setattr(rag_service, "get_vector_store", StubVectorStore)
+    governor = LLMGovernor(llm, max_concurrency=1, max_queue=1, timeout=timeout)
+    return rag_service.RAGService(llm_governor=governor)
+
+@pytest.mark.asyncio
+async def test_query_answers_with_llm(monkeypatch):
+    """Test the normal path through the governor"""
+    service = make_service(monkeypatch, FakeLLM())
+    
+    result = await service.query("When is the report due?")
+    
+    assert result["answer"] == "This is a fake answer."
+    assert result["degraded"] is False
+
+@pytest.mark.asyncio
+async def test_query_falls_back_when_llm_times_out(monkeypatch):
+    """Test the retrieval-only answer when the deadline passes"""
+    service = make_service(monkeypatch, FakeLLM(latency=0.5), timeout=0.05)
+    
+    result = await service.query("When is the report due?")
+    
+    assert result["degraded"] is True
+    assert "due on Friday" in result["answer"]
+    assert result["sources"][0]["filename"] == "syllabus.txt"
+
+@pytest.mark.asyncio
+async def test_query_falls_back_on_provider_error(monkeypatch):
+    """Test the retrieval-only answer when the provider rejects the call"""
+    service = make_service(monkeypatch, FakeLLM(error=RuntimeError("429 Resource has been exhausted")))
+    
+    result = await service.query("When is the report due?")
+    
+    assert result["degraded"] is True
+    assert result["sources"][0]["document_id"] == "doc"
+
+@pytest.mark.parametrize("query, expected", [
+    ("Is it mandatory?", True),
+    ("What about section 4?", True),
+    ("And the deadline?", True),
+    ("What is this document about?", False),
+    ("Why is the sky blue?", False),
+    ("Tell me more about how the grading scheme in this course handles late submissions", False),
+])
+def test_follow_up_detection(query, expected):
+    """Test that only short queries referring back are treated as follow-ups"""
+    assert rag_service.looks_like_follow_up(query) is expected
+
+@pytest.mark.asyncio
+async def test_rewrite_without_earlier_context_is_ignored(monkeypatch):
+    """Test that a rewrite only rephrasing the question is not used as a follow-up"""
+    session = ConversationSession("session")
+    session.add_turn("When is the lab report due?", "The lab report is due on Friday.", [], [], [])
+    
+    service = make_service(monkeypatch, FakeLLM(answer="Is the lab report mandatory?"))
+    assert await service._rewrite_follow_up("Is it mandatory?", session) == "Is the lab report mandatory?"
+    
+    service = make_service(monkeypatch, FakeLLM(answer="Is it required?"))
+    assert await service._rewrite_follow_up("Is it mandatory?", session) == "Is it mandatory?"
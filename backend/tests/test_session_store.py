@@ -0,0 +1,59 @@
+from app.services.session_store import ConversationSession
+
+def test_follow_up_reuses_previous_turn_chunks():
+    """Test that chunks behind the last answer are kept with the turn"""
+    session = ConversationSession("session")
+    session.put_retrieval(
+        "what is in section 3?", None, 2,
+        ["doc_3", "doc_4"], ["Section 3 text", "Section 4 text"],
+        [{"document_id": "doc"}, {"document_id": "doc"}]
+    )
+    session.add_turn(
+        "what is in section 3?", "It covers setup.",
+        ["doc_3", "doc_4"], ["Section 3 text", "Section 4 text"],
+        [{"document_id": "doc"}, {"document_id": "doc"}]
+    )
+    
+    ids, contexts, _ = session.previous_turn_chunks()
+    
+    assert ids == ["doc_3", "doc_4"]
+    assert contexts == ["Section 3 text", "Section 4 text"]
+
+def test_retrieval_cache_hits_for_smaller_top_k():
+    """Test that a cached search serves a later query asking for fewer chunks"""
+    session = ConversationSession("session")
+    session.put_retrieval(
+        "Main topic", None, 2,
+        ["a", "b"], ["first", "second"], [{"document_id": "doc"}, {"document_id": "doc"}]
+    )
+    
+    ids, contexts, _ = session.get_retrieval("main   topic", None, 1)
+    
+    assert ids == ["a"]
+    assert contexts == ["first"]
+    assert session.get_retrieval("main topic", None, 3) is None
+
+def test_invalidated_document_turns_retrieval_into_miss():
+    """Test that deleting a document drops its cached chunks"""
+    session = ConversationSession("session")
+    session.put_retrieval("query", None, 1, ["doc_0"], ["text"], [{"document_id": "doc"}])
+    
+    session.add_turn("query", "answer", ["doc_0"], ["text"], [{"document_id": "doc"}])
+    
+    session.invalidate_document("doc")
+    
+    assert session.get_retrieval("query", None, 1) is None
+    assert session.cached_chars == 0
+    assert session.previous_turn_chunks() == ([], [], [])
+
+def test_documents_change_elsewhere_clears_cached_retrievals():
+    """Test that a new documents version, e.g. from another worker's upload, drops cached searches"""
+    session = ConversationSession("session")
+    session.sync_documents_version(1)
+    session.put_retrieval("query", None, 1, ["doc_0"], ["text"], [{"document_id": "doc"}])
+    
+    session.sync_documents_version(1)
+    assert session.get_retrieval("query", None, 1) is not None
+    
+    session.sync_documents_version(2)
+    assert session.get_retrieval("query", None, 1) is None
\ No newline at end of file
@@ -0,0 +1,43 @@
+import pytest
+from httpx import AsyncClient
+from app.main import app
+from app.services.snapshot import PREAMBLE, SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip():
+    """Test exporting a snapshot and importing it back"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/snapshots/export")
+        
+        assert response.status_code == 200
+        assert "x-snapshot-time" in response.headers
+        
+        files = {"file": ("index.snapshot", response.content, "application/octet-stream")}
+        response = await client.post("/api/snapshots/import", files=files)
+        
+        assert response.status_code == 200
+        assert "chunk_count" in response.json()
+
+@pytest.mark.asyncio
+async def test_import_corrupted_snapshot():
+    """Test that a snapshot failing verification is rejected"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/snapshots/export")
+        corrupted = response.content[:-1] + bytes([response.content[-1] ^ 0xFF])
+        
+        files = {"file": ("index.snapshot", corrupted, "application/octet-stream")}
+        response = await client.post("/api/snapshots/import", files=files)
+        
+        assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_import_snapshot_with_corrupt_header():
+    """Test that an unreadable header is rejected rather than failing the server"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        header = b'{"count": 2, "dim": 3'
+        data = PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)) + header
+        
+        files = {"file": ("index.snapshot", data, "application/octet-stream")}
+        response = await client.post("/api/snapshots/import", files=files)
+        
+        assert response.status_code == 400
\ No newline at end of file
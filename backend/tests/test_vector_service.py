@@ -0,0 +1,70 @@
+import asyncio
+import os
+import tempfile
+import pytest
+from app.services.vector_server import VectorServer
+from app.services.vector_client import RemoteVectorStore
+
+class InMemoryVectorStore:
+    """Minimal stand-in for VectorStore that skips the embedding model"""
+    
+    def __init__(self):
+        self.chunks = {}
+    
+    async def add_document(self, document_id, chunks, metadata):
+        for i, chunk in enumerate(chunks):
+            self.chunks[f"{document_id}_{i}"] = (chunk, {**metadata, "chunk_index": i}, [0.0, 1.0])
+    
+    async def search(self, query, document_ids=None, top_k=5):
+        items = list(self.chunks.items())[:top_k]
+        return {
+            "ids": [[chunk_id for chunk_id, _ in items]],
+            "documents": [[chunk for _, (chunk, _, _) in items]],
+            "metadatas": [[metadata for _, (_, metadata, _) in items]],
+            "distances": [[0.0 for _ in items]]
+        }
+    
+    async def delete_document(self, document_id):
+        self.chunks = {k: v for k, v in self.chunks.items() if v[1]["document_id"] != document_id}
+    
+    async def count(self):
+        return len(self.chunks)
+    
+    async def get_chunks(self, since=None, offset=0, limit=1000):
+        items = list(self.chunks.items())[offset:offset + limit]
+        return {
+            "ids": [chunk_id for chunk_id, _ in items],
+            "documents": [chunk for _, (chunk, _, _) in items],
+            "metadatas": [metadata for _, (_, metadata, _) in items],
+            "embeddings": [embedding for _, (_, _, embedding) in items]
+        }
+    
+    async def upsert_chunks(self, ids, embeddings, chunks, metadatas):
+        for chunk_id, embedding, chunk, metadata in zip(ids, embeddings, chunks, metadatas):
+            self.chunks[chunk_id] = (chunk, metadata, embedding)
+
+@pytest.mark.asyncio
+async def test_remote_vector_store_round_trip():
+    """Test the socket protocol between API workers and the vector service"""
+    socket_path = os.path.join(tempfile.mkdtemp(), "vector.sock")
+    store = InMemoryVectorStore()
+    server = await asyncio.start_unix_server(VectorServer(store).handle_connection, path=socket_path)
+    
+    async with server:
+        remote = RemoteVectorStore(socket_path)
+        await remote.add_document("doc", ["first chunk", "second chunk"], {"document_id": "doc"})
+        
+        assert await remote.count() == 2
+        results = await remote.search("chunk", top_k=1)
+        assert results["documents"][0] == ["first chunk"]
+        
+        batch = await remote.get_chunks()
+        assert batch["embeddings"].shape == (2, 2)
+        
+        await remote.upsert_chunks(["copy_0"], [[0.5, 0.5]], ["copied chunk"], [{"document_id": "copy"}])
+        assert store.chunks["copy_0"][2] == [0.5, 0.5]
+        
+        await remote.delete_document("doc")
+        assert await remote.count() == 1
+        
+        await remote.close()
\ No newline at end of file
@@ -1,10 +1,14 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import time
+import uuid
 from datetime import datetime
 
 # Configuration
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+DOCUMENTS_CACHE_TTL = float(os.getenv("DOCUMENTS_CACHE_TTL", "30"))
 
 st.set_page_config(
     page_title="RAG Document Q&A",
@@ -12,9 +16,54 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Pooled HTTP session shared by every rerun and browser session"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+http = get_http_session()
+
+def fetch_documents() -> list:
+    """Return the document list, revalidating with the backend only after the TTL"""
+    cache = st.session_state.documents_cache
+    if cache["data"] is not None and time.monotonic() - cache["fetched_at"] < DOCUMENTS_CACHE_TTL:
+        return cache["data"]
+    
+    headers = client_headers()
+    if cache["etag"] and cache["data"] is not None:
+        headers["If-None-Match"] = cache["etag"]
+    
+    response = http.get(f"{BACKEND_URL}/api/documents", headers=headers)
+    if response.status_code == 304:
+        cache["fetched_at"] = time.monotonic()
+        return cache["data"]
+    
+    response.raise_for_status()
+    cache["data"] = response.json()
+    cache["etag"] = response.headers.get("ETag")
+    cache["fetched_at"] = time.monotonic()
+    return cache["data"]
+
+def invalidate_documents():
+    st.session_state.documents_cache["fetched_at"] = 0.0
+
+def client_headers() -> dict:
+    return {"X-Client-ID": st.session_state.client_id}
+
 # Initialize session state
+if 'client_id' not in st.session_state:
+    # Lets the backend apply per-client admission limits per browser session
+    st.session_state.client_id = str(uuid.uuid4())
+if 'documents_cache' not in st.session_state:
+    st.session_state.documents_cache = {"data": None, "etag": None, "fetched_at": 0.0}
 if 'messages' not in st.session_state:
     st.session_state.messages = []
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = None
 
 # Title and description
 st.title("📚 RAG Document Q&A System")
@@ -35,7 +84,8 @@ with st.sidebar:
         with st.spinner("Uploading and processing..."):
             try:
                 files = {"file": (uploaded_file.name, uploaded_file.getvalue())}
-                response = requests.post(f"{BACKEND_URL}/api/documents/upload", files=files)
+                response = http.post(f"{BACKEND_URL}/api/documents/upload", files=files, headers=client_headers())
+                invalidate_documents()
                 
                 if response.status_code == 200:
                     st.success("✅ Document uploaded successfully!")
@@ -49,26 +99,24 @@ with st.sidebar:
     # List documents
     st.subheader("📄 Uploaded Documents")
     try:
-        response = requests.get(f"{BACKEND_URL}/api/documents")
-        if response.status_code == 200:
-            documents = response.json()
-            
-            if documents:
-                for doc in documents:
-                    with st.expander(f"📄 {doc['filename'][:30]}..."):
-                        st.write(f"**Status:** {doc['status']}")
-                        st.write(f"**Pages:** {doc['page_count']}")
-                        st.write(f"**Chunks:** {doc['chunk_count']}")
-                        st.write(f"**Size:** {doc['file_size'] / 1024:.2f} KB")
-                        st.write(f"**Uploaded:** {doc['upload_date'][:19]}")
-                        
-                        if st.button(f"🗑️ Delete", key=doc['id']):
-                            del_response = requests.delete(f"{BACKEND_URL}/api/documents/{doc['id']}")
-                            if del_response.status_code == 200:
-                                st.success("Deleted!")
-                                st.rerun()
-            else:
-                st.info("No documents uploaded yet")
+        documents = fetch_documents()
+        if documents:
+            for doc in documents:
+                with st.expander(f"📄 {doc['filename'][:30]}..."):
+                    st.write(f"**Status:** {doc['status']}")
+                    st.write(f"**Pages:** {doc['page_count']}")
+                    st.write(f"**Chunks:** {doc['chunk_count']}")
+                    st.write(f"**Size:** {doc['file_size'] / 1024:.2f} KB")
+                    st.write(f"**Uploaded:** {doc['upload_date'][:19]}")
+                    
+                    if st.button(f"🗑️ Delete", key=doc['id']):
+                        del_response = http.delete(f"{BACKEND_URL}/api/documents/{doc['id']}", headers=client_headers())
+                        invalidate_documents()
+                        if del_response.status_code == 200:
+                            st.success("Deleted!")
+                            st.rerun()
+        else:
+            st.info("No documents uploaded yet")
     except Exception as e:
         st.error(f"Error loading documents: {str(e)}")
 
@@ -97,13 +145,22 @@ if query := st.chat_input("Ask a question about your documents..."):
     with st.chat_message("assistant"):
         with st.spinner("Thinking..."):
             try:
-                response = requests.post(
+                response = http.post(
                     f"{BACKEND_URL}/api/queries",
-                    json={"query": query, "top_k": 5}
+                    json={
+                        "query": query,
+                        "top_k": 5,
+                        "session_id": st.session_state.session_id,
+                        "start_session": True
+                    },
+                    headers=client_headers()
                 )
                 
                 if response.status_code == 200:
                     result = response.json()
+                    if st.session_state.session_id and result.get('session_id') != st.session_state.session_id:
+                        st.info("The earlier conversation expired, so this question was answered on its own.")
+                    st.session_state.session_id = result.get('session_id')
                     st.markdown(result['answer'])
                     
                     # Add assistant message
@@ -120,6 +177,8 @@ if query := st.chat_input("Ask a question about your documents..."):
                                 st.markdown(f"**Source {i}:** {source['filename']}")
                                 st.text(source['content'])
                                 st.divider()
+                elif response.status_code == 429:
+                    st.warning(f"The server is busy. Please try again in {response.headers.get('Retry-After', 'a few')} seconds.")
                 else:
                     st.error("Failed to get response")
             except Exception as e:
@@ -127,7 +186,16 @@ if query := st.chat_input("Ask a question about your documents..."):
 
 # Clear chat button
 if st.sidebar.button("🗑️ Clear Chat"):
+    if st.session_state.session_id:
+        try:
+            http.delete(
+                f"{BACKEND_URL}/api/queries/sessions/{st.session_state.session_id}",
+                headers=client_headers()
+            )
+        except Exception:
+            pass
     st.session_state.messages = []
+    st.session_state.session_id = None
     st.rerun()
 
 # Footer